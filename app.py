@@ -1,11 +1,17 @@
 from __future__ import annotations
-import io, time, re, requests
+import io, time, re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import streamlit as st
+import xlsxwriter
 
-from resilient_fetch import fetch_coop_table
+from resilient_fetch import complete_csv_bytes, fetch_coop_table, http_get, probe_get
 from patch_duplicate_columns import patch_duplicate_columns
 from debug_shim import display_dataframe_safe
 
@@ -26,126 +32,199 @@ FUTURE_INPUT_DEFAULTS = {"Corn (ZC) nearby": 4.50, "Soybeans (ZS) nearby": 11.50
 MANUAL_FEED_URL = st.secrets.get("MANUAL_FEED_URL", "")
 
 # ---- Processor keyword mapping (optional reassignment of location) ----
+# "anchors" are literals every pattern of that processor contains; rows without any
+# anchor are skipped before the full pattern set runs.
 PROCESSOR_PATTERNS = [
-    {"name": "ADM Cedar Rapids", "patterns": [r"\badm\b\s*[-–—:]*\s*cedar\s*rapids", r"cedar\s*rapids\s*[-–—:]*\s*\badm\b", r"\badm\b.*\bcr\b", r"\bcr\b.*\badm\b"]},
-    {"name": "Cargill Cedar Rapids (Soy)", "patterns": [r"\bcargill\b\s*[-–—:]*\s*cedar\s*rapids", r"cedar\s*rapids\s*[-–—:]*\s*\bcargill\b", r"\bcargill\b.*\bcr\b", r"\bcr\b.*\bcargill\b", r"cargill.*soy", r"soy.*cargill"]},
-    {"name": "Shell Rock Soy Processing", "patterns": [r"shell\s*rock\s*soy", r"\bsrsp\b"]},
+    {"name": "ADM Cedar Rapids", "anchors": ["adm"], "patterns": [r"\badm\b\s*[-–—:]*\s*cedar\s*rapids", r"cedar\s*rapids\s*[-–—:]*\s*\badm\b", r"\badm\b.*\bcr\b", r"\bcr\b.*\badm\b"]},
+    {"name": "Cargill Cedar Rapids (Soy)", "anchors": ["cargill"], "patterns": [r"\bcargill\b\s*[-–—:]*\s*cedar\s*rapids", r"cedar\s*rapids\s*[-–—:]*\s*\bcargill\b", r"\bcargill\b.*\bcr\b", r"\bcr\b.*\bcargill\b", r"cargill.*soy", r"soy.*cargill"]},
+    {"name": "Shell Rock Soy Processing", "anchors": ["shell", "srsp"], "patterns": [r"shell\s*rock\s*soy", r"\bsrsp\b"]},
 ]
 
+# All processors fused into one alternation; the named group that matched (p<i>) says which one.
+PROCESSOR_RE = re.compile(
+    "|".join(f"(?P<p{i}>{'|'.join(p['patterns'])})" for i, p in enumerate(PROCESSOR_PATTERNS)),
+    flags=re.I,
+)
+PROCESSOR_ANCHOR_RE = re.compile("|".join(re.escape(a) for p in PROCESSOR_PATTERNS for a in p["anchors"]))
+PROCESSOR_BY_GROUP = {f"p{i}": p["name"] for i, p in enumerate(PROCESSOR_PATTERNS)}
+DASH_RE = re.compile(r"[\u2013\u2014]+")
+WS_RE = re.compile(r"\s+")
+
+TABLE_TAG_RE = re.compile(rb"<table", re.I)
+
+# Header keywords that identify the commodity column when it isn't already named so.
+COMMODITY_COL_RE = re.compile(r"commodity|product|crop")
+# Commodity labels each futures override applies to
+CORN_RE = re.compile(r"corn", re.I)
+SOY_RE = re.compile(r"soy|bean", re.I)
+
+# ---- Fallback rows shown when no source returned a table ----
+DEMO_BIDS = pd.DataFrame({
+    "commodity": ["Corn", "Soybeans"],
+    "delivery": ["Nearby", "Nearby"],
+    "cash": [4.20, 10.85],
+    "basis": [-0.35, -0.90],
+    "location": ["Demo A", "Demo B"],
+})
+
 def _series_or_first_col(x):
     return x.iloc[:,0] if isinstance(x, pd.DataFrame) else x
 
+@lru_cache(maxsize=4096)
+def _processor_for(raw: str) -> str | None:
+    """Processor name for one routing string, or None. Rows repeat heavily, so memoize."""
+    s = WS_RE.sub(" ", DASH_RE.sub("-", raw.lower())).strip()
+    if not PROCESSOR_ANCHOR_RE.search(s):
+        return None
+    m = PROCESSOR_RE.search(s)
+    return PROCESSOR_BY_GROUP[m.lastgroup] if m else None
+
 def route_rows_to_processors(df: pd.DataFrame) -> pd.DataFrame:
     """Keep ALL rows; only re-label location for rows that match a processor pattern."""
     if df.empty:
         return df
 
-    work = df.copy()
-    cols = {str(c).lower(): c for c in work.columns}
-    delivery_col = cols.get("delivery") or next(
-        (c for c in work.columns if re.search(r"deliv|month|period", str(c), re.I)),
-        None
-    )
+    # Lowercase the headers once and resolve both lookups from that one Index.
+    lc = df.columns.astype(str).str.lower()
+    cols = dict(zip(lc, df.columns))
+    deliv_like = np.asarray(lc.str.contains(r"deliv|month|period"), dtype=bool)
+    delivery_col = cols.get("delivery") or (df.columns[deliv_like.argmax()] if deliv_like.any() else None)
     location_col = cols.get("location")
 
     if delivery_col:
-        text = _series_or_first_col(work[delivery_col].astype(str))
+        text = _series_or_first_col(df[delivery_col].astype(str))
     elif location_col:
-        text = _series_or_first_col(work[location_col].astype(str))
+        text = _series_or_first_col(df[location_col].astype(str))
     else:
-        text = work.select_dtypes(include=["object"]).astype(str).apply(lambda r: " | ".join(r.values), axis=1)
-
-    text_norm = (
-        text.str.lower()
-            .str.replace(r"[\\u2013\\u2014–—]+", "-", regex=True)
-            .str.replace(r"\\s+", " ", regex=True)
-            .str.strip()
-    )
-
-    hits = pd.Series(False, index=work.index)
-    resolved_location = pd.Series(pd.NA, index=work.index)
-
-    for proc in PROCESSOR_PATTERNS:
-        combined = re.compile("|".join(proc["patterns"]), flags=re.I)
-        hit = text_norm.str.contains(combined, na=False)
-        resolved_location.loc[hit] = proc["name"]
-        hits = hits | hit
-
-    out = work.copy()
-
-    if "location" in out.columns:
-        out.loc[hits, "location"] = resolved_location.loc[hits]
+        # Column-wise str.cat instead of a per-row apply(axis=1) join
+        obj = df.select_dtypes(include=["object", "string"]).astype(str)
+        if obj.shape[1]:
+            text = obj.iloc[:, 0].str.cat([obj.iloc[:, i] for i in range(1, obj.shape[1])], sep=" | ")
+        else:
+            text = pd.Series("", index=df.index)
+
+    # Plain comprehension over the object array: for co-op sized tables it beats chained
+    # .str calls, and repeated delivery/location strings resolve from the lru_cache.
+    # astype(str) keeps missing values on string dtypes (pandas 3, Arrow-backed feeds), so blank them.
+    labels = [_processor_for(s) for s in text.fillna("").to_numpy(dtype=object)]
+    hits = np.array([name is not None for name in labels], dtype=bool)
+    resolved_location = pd.Series(labels, index=df.index, dtype=object)
+
+    # Only whole columns change, so build them and attach with one assign;
+    # the caller's frame is never written into and needs no defensive copy.
+    if "location" in df.columns:
+        derived = {"location": df["location"].mask(hits, resolved_location)}
     else:
-        out["location"] = resolved_location
-        out["location"] = out["location"].fillna("Dunkerton")
-
-    if "source_site" not in out.columns:
-        out["source_site"] = "Dunkerton"
-
-    return out.reset_index(drop=True)
-
-@st.cache_data(ttl=10 * 60, show_spinner=True)
-def collect_all() -> tuple[pd.DataFrame, List[str], List[Dict[str, Any]]]:
+        derived = {"location": resolved_location.fillna("Dunkerton")}
+    if "source_site" not in df.columns:
+        derived["source_site"] = "Dunkerton"
+
+    return df.assign(**derived).reset_index(drop=True)
+
+# Co-op cash pages are revised a few times an hour at most; the sidebar "Force refresh"
+# button covers the case where a fresher bid is needed right away.
+REFRESH_SECONDS = 30 * 60
+
+# Expiry comes from the refresh_bucket argument: a new 30-minute bucket is a new cache key.
+# Only the current bucket (and the one just left) is ever read, so two entries bound memory.
+@st.cache_data(max_entries=2, show_spinner=True)
+def collect_all(refresh_bucket: int, _force: bool = False) -> tuple[pd.DataFrame, List[str], List[Dict[str, Any]]]:
+    # _force is left out of the cache key (leading underscore), so the forced result is
+    # stored under the normal bucket key and plain reruns hit it.
     frames: List[pd.DataFrame] = []
     issues: List[str] = []
     debug_rows: List[Dict[str, Any]] = []
-    for c in COOPS:
-        res = fetch_coop_table(c["url"], c["location"])
+    results: List[Dict[str, Any]] = []
+    if COOPS:
+        # Each source is an independent blocking fetch; fan out so the refresh costs
+        # roughly the slowest site instead of the sum. map() keeps COOPS order.
+        with ThreadPoolExecutor(max_workers=min(8, len(COOPS))) as ex:
+            results = list(ex.map(lambda c: fetch_coop_table(c["url"], c["location"], force=_force), COOPS))
+    for c, res in zip(COOPS, results):
         debug_rows.append(res)
         if res.get("ok"):
             frames.append(res["data"])
         else:
             issues.append(f'{c["name"]}: {res.get("error")} (status={res.get("status_code")}, has_table={res.get("has_table_tag")}, len={res.get("content_len")})')
-    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    # Merge the manual feed here so the combined table is built once and cached,
+    # not re-concatenated on every rerun.
+    manual_df = load_manual_feed(_force)
+    if not manual_df.empty:
+        frames.append(manual_df)
+    if len(frames) == 1:
+        table = frames[0]  # already a fresh RangeIndex frame; concat would only copy it
+    else:
+        table = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+    # A handful of distinct commodities and delivery months: keep them as categories.
+    # location stays plain text because routing relabels it on every rerun.
+    table = table.astype({c: "category" for c in ("commodity", "delivery") if c in table.columns})
+    # Cache the remaining object columns Arrow-backed: contiguous storage instead of one
+    # Python object per cell, and st.dataframe can ship them without converting. The
+    # categories above are no longer picked up here, so each column is converted once.
+    obj_cols = table.select_dtypes(include=["object", "string"]).columns
+    if len(obj_cols):
+        table = table.astype({c: "string[pyarrow]" for c in obj_cols})
     return table, issues, debug_rows
 
-def load_manual_feed() -> pd.DataFrame:
+@st.cache_data(ttl=10 * 60, show_spinner=False)
+def load_manual_feed(_force: bool = False) -> pd.DataFrame:
     if not MANUAL_FEED_URL:
         return pd.DataFrame()
     try:
-        return pd.read_csv(MANUAL_FEED_URL)
+        # Through the shared session (keep-alive, conditional GET), then Arrow's multithreaded
+        # C parser; columns stay Arrow-backed instead of becoming object arrays.
+        # A feed cut at the body cap loses its partial last row instead of parsing it.
+        body = complete_csv_bytes(http_get(MANUAL_FEED_URL, force=_force))
+        try:
+            return pacsv.read_csv(io.BytesIO(body)).to_pandas(types_mapper=pd.ArrowDtype)
+        except pa.ArrowInvalid:
+            # Ragged rows or odd quoting: pandas' parser is more forgiving.
+            return pd.read_csv(io.BytesIO(body))
     except Exception:
         return pd.DataFrame()
 
 def coerce_numeric(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
-    out = df.copy()
-    for col in cols:
-        if col in out.columns:
-            out[col] = pd.to_numeric(out[col], errors="coerce")
-    return out
+    # Fetched tables arrive already numeric from normalize_bid_table_smart;
+    # only the manual feed can still carry text here.
+    numeric = set(df.select_dtypes(include="number").columns)
+    todo = [c for c in cols if c in df.columns and c not in numeric]
+    return df.assign(**{c: pd.to_numeric(df[c], errors="coerce") for c in todo}) if todo else df
 
 def recompute_basis_if_requested(df: pd.DataFrame, futures_overrides: Dict[str, float]) -> pd.DataFrame:
     if df.empty:
         return df
-    out = df.copy()
-    out.columns = [str(c).strip().lower() for c in out.columns]
+    # Shallow copy: below, columns are only ever replaced whole, so the
+    # caller's buffers are never written through and no full-frame copy is needed.
+    out = df.copy(deep=False)
+    out.columns = out.columns.astype(str).str.strip().str.lower()
     if "commodity" not in out.columns:
-        for c in list(out.columns):
-            if any(k in c for k in ["commodity", "product", "crop"]):
-                out = out.rename(columns={c: "commodity"})
-                break
+        c = next((c for c in out.columns if COMMODITY_COL_RE.search(c)), None)
+        if c is not None:
+            out = out.rename(columns={c: "commodity"})
     if "cash" in out.columns:
         out = coerce_numeric(out, ["cash", "futures", "basis"])
+        # Classify rows once, then lay every override onto a single vector.
+        row_masks: Dict[str, np.ndarray] = {}
+        if "commodity" in out.columns:
+            # Test the few distinct labels, then spread the result to rows through the codes
+            # (code -1 is a missing label and lands on the trailing False).
+            com = out["commodity"].astype("category")
+            labels = com.cat.categories.astype(str)
+            codes = com.cat.codes.to_numpy()
+            row_masks["corn"] = np.append(np.asarray(labels.str.contains(CORN_RE), dtype=bool), False)[codes]
+            row_masks["soy"] = np.append(np.asarray(labels.str.contains(SOY_RE), dtype=bool), False)[codes]
+        override = np.full(len(out), np.nan)
         for key, fut_val in futures_overrides.items():
-            is_corn = "corn" in key.lower()
-            is_soy = "soy" in key.lower()
-            mask = pd.Series([False] * len(out))
-            if "commodity" in out.columns:
-                com = out["commodity"].astype(str).str.lower()
-                if is_corn:
-                    mask = mask | com.str.contains("corn", na=False)
-                if is_soy:
-                    mask = mask | com.str.contains("soy|bean|soybean", regex=True, na=False)
-            if "futures" in out.columns:
-                out.loc[mask, "futures"] = fut_val
-            else:
-                out["futures"] = pd.NA
-                out.loc[mask, "futures"] = fut_val
+            for crop, rows in row_masks.items():
+                if crop in key.lower():
+                    override[rows] = fut_val
+        if futures_overrides:
+            current = out["futures"].to_numpy(dtype=float, na_value=np.nan) if "futures" in out.columns else np.nan
+            out["futures"] = np.where(np.isnan(override), current, override)
         if "futures" in out.columns:
             if "basis" not in out.columns:
-                out["basis"] = pd.NA
-            missing = out["basis"].isna()
-            out.loc[missing, "basis"] = out.loc[missing, "cash"] - out.loc[missing, "futures"]
+                out["basis"] = float("nan")
+            out["basis"] = out["basis"].fillna(out["cash"] - out["futures"])
     return out
 
 def format_for_display(df: pd.DataFrame) -> pd.DataFrame:
@@ -153,7 +232,69 @@ def format_for_display(df: pd.DataFrame) -> pd.DataFrame:
         return df
     cols_order = [c for c in ["commodity", "delivery", "cash", "basis", "futures", "location", "last_refresh_epoch"] if c in df.columns]
     rest = [c for c in df.columns if c not in cols_order]
-    return df[cols_order + rest]
+    # Arrow-backed columns hand st.dataframe data it can ship without another pandas->Arrow pass.
+    return df[cols_order + rest].convert_dtypes(dtype_backend="pyarrow")
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    # Arrow writes UTF-8 straight into the buffer; to_csv builds a full str and then encodes it.
+    try:
+        buf = io.BytesIO()
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+        return buf.getvalue()
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed-type object columns (e.g. from the manual feed) have no single Arrow type.
+        return df.to_csv(index=False).encode("utf-8")
+
+def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    output = io.BytesIO()
+    # Rows are written strictly top to bottom, so constant_memory can flush each one as it
+    # goes (pandas' to_excel writes column by column and cannot use it).
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    sheet = workbook.add_worksheet("bids")
+    # Widths are cosmetic; estimate them from the first and last rows instead of stringifying
+    # every cell (the tail catches manual-feed rows appended after the fetched ones).
+    sample = (df if len(df) <= 400 else pd.concat([df.head(200), df.tail(200)])).astype(str)
+    for idx in range(sample.shape[1]):
+        try:
+            width = min(40, max(10, int(sample.iloc[:, idx].map(len).mean() + 5)))
+        except Exception:
+            width = 20
+        sheet.set_column(idx, idx, width)
+    sheet.write_row(0, 0, [str(c) for c in df.columns], workbook.add_format({"bold": True}))
+    # Plain Python values with None for missing cells; xlsxwriter leaves those blank.
+    cells = df.astype(object).where(df.notna(), None)
+    for r, row in enumerate(cells.itertuples(index=False, name=None), start=1):
+        sheet.write_row(r, 0, row)
+    workbook.close()
+    return output.getvalue()
+
+# Everything after collect_all depends only on the fetched table and the sidebar futures, so
+# cache the finished table and both downloads on exactly that key. Reruns that change neither
+# (expanders, the probe box) skip routing, recompute and serialization; a handful of entries
+# covers flipping between futures inputs.
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_outputs(refresh_bucket: int, futures: tuple[tuple[str, float], ...]) -> tuple[pd.DataFrame, bytes, bytes]:
+    table, _, _ = collect_all(refresh_bucket)
+    table = patch_duplicate_columns(table)
+    routed = route_rows_to_processors(table)
+    if not routed.empty:
+        table = routed
+    table = format_for_display(recompute_basis_if_requested(table, dict(futures)))
+    return table, to_csv_bytes(table), to_excel_bytes(table)
+
+# A minute is enough to collapse repeated reruns with the probe box ticked into one request.
+@st.cache_data(ttl=60, show_spinner=False)
+def probe_source(url: str) -> Dict[str, Any]:
+    # Same headers as the scraper, but the raw first response: status and head are shown
+    # for 403 bot blocks and 5xx pages too, which is what the probe is for.
+    r = probe_get(url, timeout=20)
+    # Work on the raw bytes: only the shown head is decoded, and no lowercased copy is made.
+    return {
+        "status_code": r.status_code,
+        "len": len(r.content),
+        "has_<table>": TABLE_TAG_RE.search(r.content) is not None,
+        "head": r.content[:1500].decode(r.encoding or "utf-8", "replace"),
+    }
 
 # ---------------- UI ----------------
 st.title("Auto-fetched Cash Bids (beta)")
@@ -161,46 +302,36 @@ st.title("Auto-fetched Cash Bids (beta)")
 with st.sidebar:
     st.header("Options")
     futures_inputs = {label: st.number_input(label, value=float(default), step=0.01, format="%.4f") for label, default in FUTURE_INPUT_DEFAULTS.items()}
+    force_refresh = st.button("Force refresh", help="Drop the cached bids and fetch every source again.")
+    if force_refresh:
+        collect_all.clear()
+        load_manual_feed.clear()
+        build_outputs.clear()
     st.divider()
     st.caption("Manual feed (optional)")
     st.info("Add MANUAL_FEED_URL to Streamlit secrets to merge a CSV/Sheet with custom rows.")
 
-table, issues, debug_rows = collect_all()
-
-manual_df = load_manual_feed()
-if not manual_df.empty:
-    table = pd.concat([table, manual_df], ignore_index=True)
-
-table = patch_duplicate_columns(table)
-
-routed = route_rows_to_processors(table)
-if not routed.empty:
-    table = routed
+refresh_bucket = int(time.time() // REFRESH_SECONDS)
+table, issues, debug_rows = collect_all(refresh_bucket, _force=force_refresh)
 
 with st.expander("Live Fetch Debug"):
     st.write("Issues:", issues or "None")
-    try:
-        r = requests.get(COOPS[0]["url"], headers={"User-Agent": "Mozilla/5.0"}, timeout=20)
-        st.write({"status_code": r.status_code, "len": len(r.text), "has_<table>": "<table" in r.text.lower()})
-        st.code(r.text[:1500], language="html")
-    except Exception as e:
-        st.error(f"Probe error: {e}")
+    # Off by default: an unchecked box costs nothing on reruns.
+    if st.checkbox("Run live probe", key="show_probe", help=f"Fetch {COOPS[0]['url']} now and show the raw response."):
+        try:
+            probe = probe_source(COOPS[0]["url"])
+            st.write({k: v for k, v in probe.items() if k != "head"})
+            st.code(probe["head"], language="html")
+        except Exception as e:
+            st.error(f"Probe error: {e}")
 
 if table.empty:
     st.warning("No live tables were collected. Showing diagnostics and fallback demo rows.")
-    demo = pd.DataFrame({
-        "commodity": ["Corn", "Soybeans"],
-        "delivery": ["Nearby", "Nearby"],
-        "cash": [4.20, 10.85],
-        "basis": [-0.35, -0.90],
-        "location": ["Demo A", "Demo B"],
-        "last_refresh_epoch": [int(time.time())] * 2
-    })
+    demo = DEMO_BIDS.assign(last_refresh_epoch=int(time.time()))
     display_dataframe_safe(demo, use_container_width=True, height=420)
     st.stop()
 
-table = recompute_basis_if_requested(table, futures_inputs)
-table = format_for_display(table)
+table, csv_bytes, xlsx_bytes = build_outputs(refresh_bucket, tuple(futures_inputs.items()))
 
 st.success(f"Collected **{len(table)}** rows")
 display_dataframe_safe(table, use_container_width=True, height=520)
@@ -209,7 +340,8 @@ with st.expander("Diagnostics (raw results sample)"):
     st.write("Issues:", issues or "None")
     for i, row in enumerate(debug_rows):
         st.subheader(f"Source #{i+1}: {row.get('location')} — {row.get('url')}")
-        st.write({"ok": row.get("ok"), "error": row.get("error"), "best_table_shape": row.get("best_table_shape")})
+        st.write({"ok": row.get("ok"), "error": row.get("error"), "best_table_shape": row.get("best_table_shape"),
+                  "body_truncated": row.get("body_truncated")})
         diags = row.get("diags") or {}
         st.write({
             "page_tables_found": diags.get("page_tables_found"),
@@ -226,20 +358,8 @@ with st.expander("Diagnostics (raw results sample)"):
             st.caption("Normalized sample:")
             display_dataframe_safe(row["data"].head(10), use_container_width=True, height=240)
 
-def to_excel_bytes(df: pd.DataFrame) -> bytes:
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        df.to_excel(writer, index=False, sheet_name="bids")
-        for idx, col in enumerate(df.columns):
-            try:
-                width = min(40, max(10, int(df[col].astype(str).str.len().mean() + 5)))
-            except Exception:
-                width = 20
-            writer.sheets["bids"].set_column(idx, idx, width)
-    return output.getvalue()
-
 c1, c2 = st.columns(2)
 with c1:
-    st.download_button("⬇️ Download CSV", data=table.to_csv(index=False).encode("utf-8"), file_name="cash_bids.csv", mime="text/csv")
+    st.download_button("⬇️ Download CSV", data=csv_bytes, file_name="cash_bids.csv", mime="text/csv")
 with c2:
-    st.download_button("⬇️ Download Excel", data=to_excel_bytes(table), file_name="cash_bids.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    st.download_button("⬇️ Download Excel", data=xlsx_bytes, file_name="cash_bids.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
@@ -6,7 +6,12 @@ def patch_duplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     if df is None or getattr(df, "empty", True):
         return df
-    df = df.copy()
+    # Common case: labels are already unique strings and there is nothing to rename.
+    if df.columns.is_unique and all(isinstance(c, str) for c in df.columns):
+        return df
+    # Only the labels change: a shallow copy shares the data buffers with the input
+    # while keeping the caller's column index untouched.
+    df = df.copy(deep=False)
     # A simple, dependency-free de-duplication
     seen = {}
     new_cols = []
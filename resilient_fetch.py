@@ -1,37 +1,136 @@
 from __future__ import annotations
-import re, time, io, requests, pandas as pd
+import re, time, io, hashlib, requests, lxml.html, numpy as np, pandas as pd
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
       "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 
-def http_get(url: str, timeout: int = 20) -> requests.Response:
-    resp = requests.get(
-        url,
-        headers={
-            "User-Agent": UA,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,text/csv;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        },
-        timeout=timeout,
-    )
-    resp.raise_for_status()
+HEADERS = {
+    "User-Agent": UA,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,text/csv;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+# One pooled session for every fetch so repeat hits on a co-op host reuse the TCP/TLS connection.
+# Rate limits and server errors from overloaded co-op hosts are retried with backoff (429s
+# honour Retry-After); after the last try the response is handed back as-is so
+# raise_for_status reports the real status.
+_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+for _scheme in ("https://", "http://"):
+    _SESSION.mount(_scheme, HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_RETRY))
+
+# The debug probe's own pool: same headers, but no mounted Retry, so a 5xx is reported
+# as sent instead of after backoff.
+_PROBE_SESSION = requests.Session()
+_PROBE_SESSION.headers.update(HEADERS)
+for _scheme in ("https://", "http://"):
+    _PROBE_SESSION.mount(_scheme, HTTPAdapter(max_retries=0))
+
+# url -> (etag, last_modified, response); lets repeat fetches revalidate instead of re-downloading
+_VALIDATORS: Dict[str, tuple] = {}
+# (url, location) -> (content digest, fetch_coop_table result); skips re-parsing unchanged
+# pages. Bounded, oldest entry evicted first.
+_PARSE_CACHE: Dict[tuple, tuple] = {}
+_PARSE_CACHE_SIZE = 128
+# (table content digest, headers, location) -> normalized frame, oldest evicted first
+_NORM_CACHE: Dict[tuple, pd.DataFrame] = {}
+_NORM_CACHE_SIZE = 256
+# Bid pages are tens of KB; anything past this is not worth downloading or parsing
+_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+def _read_capped(resp: requests.Response) -> None:
+    # Pull the body in chunks and stop at _MAX_BODY_BYTES, so a runaway page is truncated
+    # instead of being buffered (and later parsed) in full. Storing the bytes in requests'
+    # private _content is what Response.content itself does after a read, so .content/.text
+    # then serve the capped body as usual. resp.body_truncated records whether bytes were cut.
+    buf = bytearray()
+    truncated = False
+    try:
+        for chunk in resp.iter_content(chunk_size=65536):
+            buf += chunk
+            if len(buf) > _MAX_BODY_BYTES:
+                del buf[_MAX_BODY_BYTES:]
+                truncated = True
+                break
+    finally:
+        resp.close()  # also when the read fails mid-body, so the connection is not leaked
+    resp._content = bytes(buf)
+    resp.body_truncated = truncated
+
+def complete_csv_bytes(resp: requests.Response) -> bytes:
+    # A capped CSV body usually ends mid-row; keep only whole lines so the cut-off row is
+    # not parsed as if it were complete.
+    body = resp.content
+    if getattr(resp, "body_truncated", False):
+        body = body[:body.rfind(b"\n") + 1]
+    return body
+
+def http_get(url: str, timeout: int = 20, force: bool = False) -> requests.Response:
+    # force=True skips revalidation and always downloads a fresh body.
+    headers = {}
+    cached = None if force else _VALIDATORS.get(url)
+    if cached:
+        etag, last_modified, _ = cached
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
+    resp = _SESSION.get(url, headers=headers, timeout=timeout, stream=True)
+    if resp.status_code == 304 and cached:
+        resp.close()
+        return cached[2]
+    if not resp.ok:
+        resp.close()  # unread streamed body: hand the pooled connection back before raising
+        resp.raise_for_status()
+    _read_capped(resp)
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _VALIDATORS[url] = (etag, last_modified, resp)
+    return resp
+
+def probe_get(url: str, timeout: int = 20) -> requests.Response:
+    # Diagnostics only: one GET on _PROBE_SESSION. No retries, no status check and no
+    # validators, so a 403 bot block or a 503 comes back exactly as the site sent it.
+    resp = _PROBE_SESSION.get(url, timeout=timeout, stream=True)
+    _read_capped(resp)
     return resp
 
+def _decode_body(resp: requests.Response, body: bytes | None = None) -> str:
+    # resp.text falls back to ISO-8859-1 for text/* without a declared charset (mangling
+    # UTF-8 dashes) or runs charset detection over the whole body. Decode once instead.
+    # body overrides resp.content, e.g. a CSV already trimmed by complete_csv_bytes.
+    if body is None:
+        body = resp.content
+    if "charset" in resp.headers.get("Content-Type", "").lower():
+        try:
+            return str(body, resp.encoding, errors="replace")
+        except (LookupError, TypeError):
+            return str(body, errors="replace")
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        return body.decode(resp.apparent_encoding or "latin-1", errors="replace")
+
 def _make_unique(cols):
+    names = list(map(str, cols))
+    # Headers are almost always distinct already; the set check is all that path costs.
+    if len(set(names)) == len(names):
+        return names
     seen = {}
     out = []
-    for c in map(str, cols):
-        if c not in seen:
-            seen[c] = 1
-            out.append(c)
-        else:
-            seen[c] += 1
-            out.append(f"{c}_{seen[c]}")
+    append = out.append
+    for c in names:
+        n = seen.get(c, 0) + 1
+        seen[c] = n
+        append(c if n == 1 else f"{c}_{n}")
     return out
 
 def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -45,9 +144,176 @@ def _strip_empty(df: pd.DataFrame) -> pd.DataFrame:
     df = df.dropna(axis=1, how="all")
     return df
 
+_RX_NUMBER = re.compile(r"[-+]?\d*\.?\d+")
+# Scans the raw bytes case-insensitively; no lowercased copy of the page.
+_TABLE_TAG = re.compile(rb"<table", re.I)
+_TABLE_TAG_TEXT = re.compile(r"<table", re.I)
+
+# Link/iframe hints for read_tables_any's follow-up fetches
+_RX_CSV_HREF = re.compile(r"cashbid[-_]download\.php", re.I)
+_RX_IFRAME_HINT = re.compile(r"(bid|bids|cash|market|quote|grain|table)", re.I)
+
+# Crop names, and the melt id columns _long_form looks for in wide tables
+_RX_CROP = re.compile(r"corn|soy|bean|soybean", re.I)
+_RX_ID_DELIVERY = re.compile(r"deliv|month|period|delivery", re.I)
+_RX_ID_LOCATION = re.compile(r"location|loc|name", re.I)
+
+# Column-name classifiers for normalize_bid_table_smart, compiled once at import
+_RX_COMMODITY = re.compile(r"comm|product|crop", re.I)
+_RX_DELIVERY = re.compile(r"^delivery(?:\s|$)|deliv|month|period")
+_RX_DELIVERY_START = re.compile(r"delivery\s*start")
+_RX_DELIVERY_END = re.compile(r"delivery\s*end")
+_RX_FUTURES = re.compile(r"fut|cbot")
+_RX_CASH = re.compile(r"(?:\$\s*price|^price$|cash|bid)")
+_RX_LOCATION = re.compile(r"location|loc")
+_RX_WS = re.compile(r"\s+")
+
 TABLE_MATCH = re.compile(r"(corn|soy|soybean|cash|basis|bid|cbot|fut|delivery|month|price)", re.I)
+# Upper bound on keyword-matching tables built per page
+_TABLE_TOP_K = 5
+# Iframe follow-up fetches per page
+_MAX_IFRAMES = 8
+# Normalized rows (with cash and commodity) after which fetch_coop_table stops looking
+_GOOD_TABLE_ROWS = 5
+
+def _read_html(text: str) -> List[pd.DataFrame]:
+    # lxml is several times faster than html5lib; only fall back when it finds nothing.
+    # Wrap in StringIO: newer pandas no longer accepts literal HTML strings.
+    for flavor in ["lxml", "html5lib"]:
+        try:
+            tables = pd.read_html(io.StringIO(text), flavor=flavor)
+        except Exception:
+            continue
+        if tables:
+            return tables
+    return []
+
+def _table_to_frame(table) -> pd.DataFrame | None:
+    """Build a frame straight from an lxml <table> element.
+
+    Handles the plain grids co-op pages use (one optional header row, no spans).
+    Returns None for anything else so the caller can fall back to pd.read_html.
+    """
+    rows = table.xpath("./tr|./thead/tr|./tbody/tr|./tfoot/tr")
+    if len(table.xpath("./thead/tr")) > 1:
+        return None
+    cells, header = [], None
+    for i, tr in enumerate(rows):
+        tds = [c for c in tr if c.tag in ("td", "th")]
+        if not tds:
+            continue
+        if any(c.get("colspan", "1") != "1" or c.get("rowspan", "1") != "1" for c in tds):
+            return None
+        texts = [" ".join(c.text_content().split()) or None for c in tds]
+        if header is None and not cells and (tr.getparent().tag == "thead" or all(c.tag == "th" for c in tds)):
+            header = texts
+        else:
+            cells.append(texts)
+    width = len(header) if header is not None else (len(cells[0]) if cells else 0)
+    if not cells or any(len(r) != width for r in cells):
+        return None
+    return pd.DataFrame(cells, columns=header if header is not None else range(width))
+
+def _header_text(table) -> str:
+    cells = table.xpath(".//th")
+    if not cells:
+        first = table.xpath("(.//tr)[1]")
+        cells = first[0].xpath("./td") if first else []
+    return " ".join(c.text_content() for c in cells)
+
+def _parse_html(text: str):
+    try:
+        return lxml.html.fromstring(text)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration; give it bytes.
+        try:
+            return lxml.html.fromstring(text.encode("utf-8"))
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+def _read_tables(text: str, root=None) -> List[pd.DataFrame]:
+    # Walk the lxml tree once and build frames directly; only tables with spans or
+    # multi-row headers take the slower pd.read_html route.
+    if root is None:
+        root = _parse_html(text)
+    if root is None:
+        return _read_html(text)
+    # Screen on header text before building anything: layout/navigation tables rarely
+    # carry bid keywords. If nothing matches, keep every table as before.
+    found = list(root.iter("table"))
+    # Prune what cannot be a bid grid before building anything: layout tables that wrap
+    # another table, and tables with fewer than two rows.
+    elements = [el for el in found if el.find(".//table") is None and len(el.xpath(".//tr")) >= 2]
+    relevant = [el for el in elements if TABLE_MATCH.search(_header_text(el))]
+    if len(relevant) > _TABLE_TOP_K:
+        # Only build the tables with the most keyword hits in their text, kept in page order.
+        hits = [len(TABLE_MATCH.findall(el.text_content())) for el in relevant]
+        top = sorted(range(len(relevant)), key=hits.__getitem__, reverse=True)[:_TABLE_TOP_K]
+        relevant = [relevant[i] for i in sorted(top)]
+    out = []
+    for el in relevant or elements:
+        df = _table_to_frame(el)
+        if df is None:
+            try:
+                df = pd.read_html(io.StringIO(lxml.html.tostring(el, encoding="unicode")), flavor="lxml")[0]
+            except Exception:
+                continue
+        out.append(df)
+    if out or (found and not elements) or not _TABLE_TAG_TEXT.search(text):
+        # Nothing but pruned tables, or no <table> anywhere (iframe shells, CSV-link pages):
+        # a whole-document read_html retry would only burn an html5lib parse to find nothing.
+        return out
+    return _read_html(text)
+
+def _is_bid_grid(norm: pd.DataFrame | None) -> bool:
+    # A normalized table with enough priced commodity rows is the bid table.
+    return (norm is not None and len(norm) >= _GOOD_TABLE_ROWS
+            and "cash" in norm.columns and "commodity" in norm.columns)
+
+def _try_get(url: str, force: bool = False) -> requests.Response | None:
+    try:
+        return http_get(url, timeout=20, force=force)
+    except Exception:
+        return None
+
+def _clean_tables(tables: List[pd.DataFrame], seen: set) -> List[pd.DataFrame]:
+    # The same table often arrives twice (page and CSV export, or two embeds); a content
+    # hash of the raw frame drops repeats before they are cleaned or normalized.
+    cleaned = []
+    for df in tables:
+        try:
+            key = (tuple(map(str, df.columns)),
+                   hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(),
+                                   digest_size=8).digest())
+            if key in seen:
+                continue
+            seen.add(key)
+        except Exception:
+            pass  # unhashable cells: keep the table rather than risk dropping it
+        try:
+            df = _flatten_columns(df.copy(deep=False))
+            df = _strip_empty(df)
+            cleaned.append(df)
+        except Exception:
+            pass
+    return cleaned
+
+def _snippets(tables: List[pd.DataFrame]) -> List[Dict[str, Any]]:
+    out = []
+    for i, t in enumerate(tables[:3]):
+        try:
+            previews = t.head(5).astype(str).to_dict(orient="list")
+            out.append({"index": i, "shape": getattr(t, "shape", None), "head_rows": previews})
+        except Exception:
+            pass
+    return out
 
-def read_tables_any(resp_text: str, base_url: str | None = None) -> Dict[str, Any]:
+def read_tables_any(resp_text: str, base_url: str | None = None, force: bool = False) -> Dict[str, Any]:
+    # Page tables and CSV exports are read here. Iframe targets come back unfetched under
+    # "iframe_targets": fetch_coop_table follows them (read_iframe_tables) only when
+    # nothing here normalizes to a bid grid.
     diagnostics = {
         "page_tables_found": 0,
         "page_table_shapes": [],
@@ -57,120 +323,120 @@ def read_tables_any(resp_text: str, base_url: str | None = None) -> Dict[str, An
         "csv_urls_tried": [],
         "csv_tables_found": 0,
         "csv_table_shapes": [],
+        "truncated_urls": [],
         "snippets": [],
     }
     all_tables: List[pd.DataFrame] = []
 
-    # Try HTML at page-level with/without match
-    for flavor in ["lxml", "html5lib"]:
-        for match_expr in [None, TABLE_MATCH]:
-            try:
-                tables = pd.read_html(resp_text, flavor=flavor, match=match_expr)
-                for t in tables:
-                    all_tables.append(t)
-                    diagnostics["page_tables_found"] += 1
-                    diagnostics["page_table_shapes"].append(getattr(t, "shape", None))
-            except Exception:
-                pass
-
-    # Element-level tables
-    try:
-        soup = BeautifulSoup(resp_text, "html.parser")
-        for t in soup.find_all("table"):
+    # Parse the page once; the table, CSV-link and iframe passes all walk this one tree.
+    root = _parse_html(resp_text)
+
+    # Page-level tables (_read_tables already visits every <table> element, so there is
+    # no separate per-element pass re-parsing the same tables)
+    for t in _read_tables(resp_text, root):
+        all_tables.append(t)
+        diagnostics["page_tables_found"] += 1
+        diagnostics["page_table_shapes"].append(getattr(t, "shape", None))
+
+    # CSV export links (e.g., /markets/cashbid-download.php) and iframes (in case the table
+    # lives in an embedded page), collected in one walk over just those tags
+    csv_targets: List[str] = []
+    iframe_targets: List[str] = []
+    if root is not None:
+        for el in root.iter("a", "iframe"):
+            if el.tag == "a":
+                href = el.get("href") or ""
+                if href and _RX_CSV_HREF.search(href):
+                    csv_targets.append(urljoin(base_url, href) if base_url else href)
+            else:
+                src = el.get("src") or ""
+                if src and _RX_IFRAME_HINT.search(src):
+                    iframe_targets.append(urljoin(base_url, src) if base_url else src)
+
+    # Pages repeat the same embed/export link (header and footer); fetch each once, and
+    # bound the iframe follow-ups so an ad-heavy page cannot fan out indefinitely.
+    csv_targets = list(dict.fromkeys(csv_targets))
+    iframe_targets = list(dict.fromkeys(iframe_targets))[:_MAX_IFRAMES]
+    diagnostics["csv_urls_tried"].extend(csv_targets)
+
+    # Sub-resources are independent blocking fetches: issue them together so a page with
+    # k exports costs about one round trip instead of k. map() keeps the input order.
+    responses: List[requests.Response | None] = []
+    if csv_targets:
+        with ThreadPoolExecutor(max_workers=min(8, len(csv_targets))) as ex:
+            responses = list(ex.map(lambda u: _try_get(u, force), csv_targets))
+
+    for r_csv in responses:
+        if r_csv is None:
+            continue
+        try:
+            if getattr(r_csv, "body_truncated", False):
+                diagnostics["truncated_urls"].append(r_csv.url)
+            # Capped mid-row: complete_csv_bytes drops the partial last line before decoding
+            text = _decode_body(r_csv, complete_csv_bytes(r_csv))
+            # Attempt to parse CSV; sometimes it's HTML disguised, so try both
+            parsed = None
             try:
-                tables = pd.read_html(str(t))
-                for df in tables:
-                    all_tables.append(df)
-                    diagnostics["page_tables_found"] += 1
-                    diagnostics["page_table_shapes"].append(getattr(df, "shape", None))
+                parsed = pd.read_csv(io.StringIO(text))
             except Exception:
-                pass
-    except Exception:
-        pass
-
-    # CSV export link (e.g., /markets/cashbid-download.php)
-    try:
-        soup = BeautifulSoup(resp_text, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if re.search(r"cashbid[-_]download\\.php", href, re.I):
-                target = urljoin(base_url, href) if base_url else href
-                diagnostics["csv_urls_tried"].append(target)
-                try:
-                    r_csv = http_get(target, timeout=20)
-                    # Attempt to parse CSV; sometimes it's HTML disguised, so try both
-                    text = r_csv.text
-                    parsed = None
-                    try:
-                        parsed = pd.read_csv(io.StringIO(text))
-                    except Exception:
-                        try:
-                            parsed = pd.read_html(text)[0]
-                        except Exception:
-                            parsed = None
-                    if isinstance(parsed, pd.DataFrame):
-                        parsed = _strip_empty(_flatten_columns(parsed))
-                        all_tables.append(parsed)
-                        diagnostics["csv_tables_found"] += 1
-                        diagnostics["csv_table_shapes"].append(getattr(parsed, "shape", None))
-                except Exception:
-                    pass
-    except Exception:
-        pass
-
-    # Follow iframes (in case CSV not present and table is in embedded page)
-    try:
-        soup = BeautifulSoup(resp_text, "html.parser")
-        iframes = soup.find_all("iframe")
-        for iframe in iframes:
-            src = iframe.get("src") or ""
-            if not src:
-                continue
-            if re.search(r"(bid|bids|cash|market|quote|grain|table)", src, re.I):
-                target = urljoin(base_url, src) if base_url else src
-                diagnostics["iframe_urls_tried"].append(target)
-                try:
-                    r_if = http_get(target, timeout=20)
-                    if r_if.ok:
-                        for flavor in ["lxml", "html5lib"]:
-                            for match_expr in [None, TABLE_MATCH]:
-                                try:
-                                    tables = pd.read_html(r_if.text, flavor=flavor, match=match_expr)
-                                    for t in tables:
-                                        all_tables.append(t)
-                                        diagnostics["iframe_tables_found"] += 1
-                                        diagnostics["iframe_table_shapes"].append(getattr(t, "shape", None))
-                                except Exception:
-                                    pass
-                except Exception:
-                    pass
-    except Exception:
-        pass
-
-    # Clean and preview
-    cleaned = []
-    for df in all_tables:
-        try:
-            df = _flatten_columns(df.copy())
-            df = _strip_empty(df)
-            cleaned.append(df)
+                tables = _read_html(text)
+                parsed = tables[0] if tables else None
+            if isinstance(parsed, pd.DataFrame):
+                parsed = _strip_empty(_flatten_columns(parsed))
+                all_tables.append(parsed)
+                diagnostics["csv_tables_found"] += 1
+                diagnostics["csv_table_shapes"].append(getattr(parsed, "shape", None))
         except Exception:
             pass
 
-    diagnostics["snippets"] = []
-    for i, t in enumerate(cleaned[:3]):
+    cleaned = _clean_tables(all_tables, set())
+    diagnostics["snippets"] = _snippets(cleaned)
+    return {"tables": cleaned, "diagnostics": diagnostics, "iframe_targets": iframe_targets}
+
+def read_iframe_tables(targets: List[str], diagnostics: Dict[str, Any], force: bool = False) -> List[pd.DataFrame]:
+    # Follow-up for read_tables_any's "iframe_targets"; records into the same diagnostics.
+    diagnostics["iframe_urls_tried"].extend(targets)
+    responses: List[requests.Response | None] = []
+    if targets:
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as ex:
+            responses = list(ex.map(lambda u: _try_get(u, force), targets))
+
+    found: List[pd.DataFrame] = []
+    for r_if in responses:
+        if r_if is None or not r_if.ok:
+            continue
+        if getattr(r_if, "body_truncated", False):
+            diagnostics["truncated_urls"].append(r_if.url)
         try:
-            previews = t.astype(str).head(5).to_dict(orient="list")
-            diagnostics["snippets"].append({"index": i, "shape": getattr(t, "shape", None), "head_rows": previews})
+            for t in _read_tables(_decode_body(r_if)):
+                found.append(t)
+                diagnostics["iframe_tables_found"] += 1
+                diagnostics["iframe_table_shapes"].append(getattr(t, "shape", None))
         except Exception:
             pass
+    return _clean_tables(found, set())
+
 
-    return {"tables": cleaned, "diagnostics": diagnostics}
+def _to_num(ser: pd.Series) -> pd.Series:
+    # Bid grids are short, so one regex search per value beats a chain of .str calls.
+    # Taking the first signed number (after dropping thousands separators and spaces, so
+    # a basis written "- 0.91" keeps its sign) also keeps cells like "4.10 (-0.05)" or
+    # "3.985 ▲" instead of mashing them into NaN.
+    found = [_RX_NUMBER.search(str(v).replace(",", "").replace(" ", "")) for v in ser]
+    return pd.Series([float(m.group()) if m else np.nan for m in found], index=ser.index, dtype=float)
 
 def _long_form(df: pd.DataFrame) -> pd.DataFrame:
-    commodity_like_cols = [c for c in df.columns if re.search(r"corn|soy|bean|soybean", str(c), re.I)]
-    delivery_col = next((c for c in df.columns if re.search(r"deliv|month|period|delivery", str(c), re.I)), None)
-    location_col = next((c for c in df.columns if re.search(r"location|loc|name", str(c), re.I)), None)
+    # One pass over the headers, each label stringified once, feeds all three detectors
+    commodity_like_cols = []
+    delivery_col = location_col = None
+    for c in df.columns:
+        label = str(c)
+        if _RX_CROP.search(label):
+            commodity_like_cols.append(c)
+        if delivery_col is None and _RX_ID_DELIVERY.search(label):
+            delivery_col = c
+        if location_col is None and _RX_ID_LOCATION.search(label):
+            location_col = c
 
     if commodity_like_cols:
         id_vars = []
@@ -178,48 +444,65 @@ def _long_form(df: pd.DataFrame) -> pd.DataFrame:
         if location_col: id_vars.append(location_col)
         try:
             melted = df.melt(id_vars=id_vars, value_vars=commodity_like_cols, var_name="commodity", value_name="cash")
-            return melted
+            # Sparse grids leave many empty crop/month cells; they would only be dropped
+            # after numeric cleaning, so shed them before any of that work.
+            return melted.dropna(subset=["cash"])
         except Exception:
             pass
 
     first_col = df.columns[0]
-    if re.search(r"comm|product|crop", str(first_col), re.I):
+    if _RX_COMMODITY.search(str(first_col)):
         return df
 
-    sample = df[first_col].astype(str).head(20).str.lower()
-    if sample.str.contains(r"corn|soy|bean|soybean", regex=True).any():
+    sample = df[first_col].head(20).astype(str)
+    if sample.str.contains(_RX_CROP).any():
         df = df.rename(columns={first_col: "commodity"})
         return df
 
     return df
 
-def normalize_bid_table_smart(df: pd.DataFrame, location: str) -> pd.DataFrame:
-    df = df.copy()
-    df = _flatten_columns(df)
-    df = _strip_empty(df)
+@lru_cache(maxsize=256)
+def _classify_headers(headers: tuple) -> tuple:
+    # Map common column names (including Barchart export). Every header is classified
+    # in one vectorized pass; np.select keeps the first matching rule, like an if/elif chain.
+    lc = pd.Index(headers).str.strip().str.lower()
+    rules = [
+        (lc.str.contains(_RX_COMMODITY), "commodity"),
+        # start/end first: the broader delivery pattern ("deliv") would swallow them
+        (lc.str.contains(_RX_DELIVERY_START), "delivery_start"),
+        (lc.str.contains(_RX_DELIVERY_END), "delivery_end"),
+        (lc.str.contains(_RX_DELIVERY), "delivery"),
+        (lc == "name", "location"),
+        (lc.str.contains("basis", regex=False), "basis"),
+        (lc.str.contains(_RX_FUTURES), "futures"),
+        (lc.str.contains(_RX_CASH), "cash"),
+        (lc.str.contains(_RX_LOCATION), "location"),
+    ]
+    labels = np.select([np.asarray(m, dtype=bool) for m, _ in rules], [name for _, name in rules],
+                       default=np.asarray(headers, dtype=object))
+    # Several headers can land on one name (e.g. "Delivery" and "Futures Month");
+    # the first keeps it, the rest get suffixes so df[name] stays a Series.
+    return tuple(_make_unique(labels))
+
+def normalize_bid_table_smart(df: pd.DataFrame, location: str, *, already_cleaned: bool = False) -> pd.DataFrame:
+    # Shallow copy: columns get relabelled in place below, but every other step returns a new
+    # frame, so the caller's table only needs its column labels protected, not its data.
+    # Tables from read_tables_any are flattened and stripped already (already_cleaned=True).
+    df = df.copy(deep=False)
+    if not already_cleaned:
+        df = _flatten_columns(df)
+        df = _strip_empty(df)
     df = _long_form(df)
 
-    # Map common column names (including Barchart export)
-    cmap: Dict[str, str] = {}
-    for c in df.columns:
-        lc = str(c).lower().strip()
-        if re.search(r"comm|product|crop", lc): cmap[c] = "commodity"
-        elif re.search(r"^delivery(\\s|$)|deliv|month|period", lc): cmap[c] = "delivery"
-        elif re.search(r"delivery\\s*start", lc): cmap[c] = "delivery_start"
-        elif re.search(r"delivery\\s*end", lc): cmap[c] = "delivery_end"
-        elif lc == "name": cmap[c] = "location"
-        elif "basis" in lc: cmap[c] = "basis"
-        elif re.search(r"fut|cbot", lc): cmap[c] = "futures"
-        elif re.search(r"(\\$\\s*price|^price$|cash|bid)", lc): cmap.setdefault(c, "cash")
-        elif re.search(r"location|loc", lc): cmap[c] = "location"
-        else: cmap[c] = c
-    df = df.rename(columns=cmap)
+    # Each site serves the same header row on every poll, so the mapping is memoized.
+    df.columns = _classify_headers(tuple(map(str, df.columns)))
 
     # If only start/end are present, create a compact 'delivery'
     if "delivery" not in df.columns and ("delivery_start" in df.columns or "delivery_end" in df.columns):
-        start = df.get("delivery_start").astype(str) if "delivery_start" in df.columns else ""
-        end = df.get("delivery_end").astype(str) if "delivery_end" in df.columns else ""
-        combo = (start.fillna("") + "–" + end.fillna("")).str.strip("– ").replace({"–": "Nearby"})
+        blank = pd.Series("", index=df.index)
+        start = df["delivery_start"].fillna("").astype(str) if "delivery_start" in df.columns else blank
+        end = df["delivery_end"].fillna("").astype(str) if "delivery_end" in df.columns else blank
+        combo = (start + "–" + end).str.strip("– ")
         df["delivery"] = combo.replace({"": "Nearby"})
 
     if "delivery" not in df.columns:
@@ -228,59 +511,144 @@ def normalize_bid_table_smart(df: pd.DataFrame, location: str) -> pd.DataFrame:
     # Clean numeric columns
     for col in ["cash", "basis", "futures"]:
         if col in df.columns:
-            ser = df[col]
-            if isinstance(ser, pd.DataFrame): ser = ser.iloc[:, 0]
-            ser = ser.astype(str).str.replace(r"[^0-9.\\-+]", "", regex=True).replace({"": None})
-            df[col] = pd.to_numeric(ser, errors="coerce")
+            df[col] = _to_num(df[col])
 
     # If missing 'cash', choose a reasonable numeric column
     if "cash" not in df.columns:
-        numeric_candidates = []
-        for c in df.columns:
-            try:
-                vals = pd.to_numeric(df[c], errors="coerce")
-                if vals.notna().sum() >= max(1, len(df)//3):
-                    numeric_candidates.append((c, vals.notna().sum()))
-            except Exception:
-                pass
-        if numeric_candidates:
-            numeric_candidates.sort(key=lambda x: x[1], reverse=True)
-            best = numeric_candidates[0][0]
-            df = df.rename(columns={best: "cash"})
-
-    # Filter commodity labels if present
+        # Convert once: the same coerced values score the candidates and become the cash column.
+        nums = df.apply(pd.to_numeric, errors="coerce")
+        counts = nums.notna().sum()
+        candidates = counts[counts >= max(1, len(df)//3)]
+        if not candidates.empty:
+            # idxmax keeps the first column on ties, as the old stable sort did
+            best = candidates.idxmax()
+            df = df.rename(columns={best: "cash"}).assign(cash=nums[best])
+
+    # Text columns move to the string dtype once, so the .str passes below run on
+    # the Arrow string kernels instead of materialising new object arrays each time.
+    df = df.assign(**{c: df[c].astype("string") for c in ("commodity", "delivery") if c in df.columns})
+
+    # Filter commodity labels if present (_RX_CROP is case-insensitive, no lower() pass needed)
     if "commodity" in df.columns:
-        m = df["commodity"].astype(str).str.lower().str.contains("corn|soy|bean|soybean", regex=True, na=False)
+        m = df["commodity"].str.contains(_RX_CROP, na=False)
         if m.any():
-            df = df[m].copy()
+            df = df[m]
 
+    # Build the derived columns together and add them in one assign rather than
+    # growing the frame a column at a time.
+    derived: Dict[str, Any] = {
+        "delivery": df["delivery"].str.replace(_RX_WS, " ", regex=True).str.strip(),
+        "last_refresh_epoch": int(time.time()),
+    }
     if "location" not in df.columns:
-        df["location"] = location
-
+        derived["location"] = location
     if "basis" not in df.columns and all(c in df.columns for c in ["cash", "futures"]):
-        df["basis"] = df["cash"] - df["futures"]
+        derived["basis"] = df["cash"] - df["futures"]
+    df = df.assign(**derived)
 
-    if "cash" in df.columns or "basis" in df.columns:
-        df = df[(df.get("cash").notna() | df.get("basis").notna())]
+    # Keep rows priced by cash or basis; tables may carry only one of the two.
+    priced = [df[c].notna().to_numpy() for c in ("cash", "basis") if c in df.columns]
+    rows = np.logical_or.reduce(priced) if priced else slice(None)
 
-    df["delivery"] = df["delivery"].astype(str).str.replace(r"\\s+", " ", regex=True).str.strip()
-    df["last_refresh_epoch"] = int(time.time())
     order = [c for c in ["commodity","delivery","cash","basis","futures","location","last_refresh_epoch"] if c in df.columns]
     rest = [c for c in df.columns if c not in order]
-    return df[order + rest].reset_index(drop=True)
+    # Row filter and column order in one .loc, so the frame is materialized once
+    return df.loc[rows, order + rest].reset_index(drop=True)
+
+def _table_score(t: pd.DataFrame) -> int:
+    # Cheap pre-normalize ranking: big tables with bid keywords in the header
+    return t.shape[0] * t.shape[1] + 100 * bool(TABLE_MATCH.search(" ".join(map(str, t.columns))))
 
-def fetch_coop_table(url: str, location: str) -> Dict[str, Any]:
+def _normalize_cached(df: pd.DataFrame, location: str) -> pd.DataFrame:
+    # Co-op sites share templates, so the same cleaned table shows up across pages and
+    # refreshes; normalization is deterministic in (content, location), so reuse it.
+    try:
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(),
+                                 digest_size=16).digest()
+    except Exception:
+        return normalize_bid_table_smart(df, location, already_cleaned=True)
+    key = (digest, tuple(map(str, df.columns)), location)
+    hit = _NORM_CACHE.get(key)
+    if hit is not None:
+        return hit.assign(last_refresh_epoch=int(time.time()))
+    norm = normalize_bid_table_smart(df, location, already_cleaned=True)
+    if len(_NORM_CACHE) >= _NORM_CACHE_SIZE:
+        _NORM_CACHE.pop(next(iter(_NORM_CACHE), None), None)  # fetches run in threads
+    _NORM_CACHE[key] = norm
+    return norm
+
+def _pick_best(tables: List[pd.DataFrame], location: str, start: int = 0):
+    # Normalize each candidate, keeping the one with the most rows. Returns
+    # (best, best_shape, best_preview, per_table_meta, found_grid); per_table indices
+    # are offset by start so a second batch lines up after the first.
+    best = None; best_rows = 0; best_shape = None; best_preview = None
+    per_table_meta = []
+    found_grid = False
+    # Likeliest candidates first, so the early exit below usually fires on the first
+    # one. sorted() is stable: ties keep page order.
+    for idx in sorted(range(len(tables)), key=lambda i: _table_score(tables[i]), reverse=True):
+        t = tables[idx]
+        rows = 0
+        try:
+            norm = _normalize_cached(t, location)
+            rows = len(norm)
+            if rows > best_rows:
+                best_rows = rows
+                best = norm
+                best_shape = getattr(t, "shape", None)
+                try:
+                    best_preview = t.head(5).astype(str).to_dict(orient="list")
+                except Exception:
+                    best_preview = None
+        except Exception as e:
+            per_table_meta.append({"index": start + idx, "norm_error": str(e), "shape": getattr(t, "shape", None)})
+            continue
+        per_table_meta.append({"index": start + idx, "normalized_rows": rows, "shape": getattr(t, "shape", None)})
+        found_grid = found_grid or _is_bid_grid(norm)
+        # A table with enough priced commodity rows is the bid table; skip normalizing the rest.
+        if rows == best_rows and _is_bid_grid(norm):
+            break
+    return best, best_shape, best_preview, per_table_meta, found_grid
+
+def fetch_coop_table(url: str, location: str, force: bool = False) -> Dict[str, Any]:
+    # force=True (the dashboard's "Force refresh") bypasses revalidation and the parse cache,
+    # for the page and its iframe/CSV follow-ups alike.
     meta = {"url": url, "location": location}
     try:
-        resp = http_get(url)
+        resp = http_get(url, force=force)
     except Exception as e:
         return {"ok": False, "error": f"http_error: {e}", **meta}
+    # Reported on every result below, so a page cut at _MAX_BODY_BYTES is never silent
+    meta["body_truncated"] = getattr(resp, "body_truncated", False)
     try:
-        html = resp.text
-        parsed = read_tables_any(html, base_url=url)
+        digest = hashlib.blake2b(resp.content, digest_size=16).digest()
+        cached = None if force else _PARSE_CACHE.get((url, location))
+        if cached and cached[0] == digest:
+            # 304s land here too: http_get hands back the stored response, so the
+            # digest matches and the whole parse is skipped. assign() leaves the
+            # cached frame untouched without deep-copying it.
+            hit = cached[1]
+            return {**hit, "data": hit["data"].assign(last_refresh_epoch=int(time.time()))}
+
+        html = _decode_body(resp)
+        parsed = read_tables_any(html, base_url=url, force=force)
         tables = parsed["tables"]
         diags = parsed["diagnostics"]
 
+        best, best_shape, best_preview, per_table_meta, found_grid = _pick_best(tables, location)
+        # Embeds only matter when the page itself has no usable bid grid; a futures board
+        # or quote table on the page must not stand in for cash bids. Repeats of a page
+        # table come back from _normalize_cached rather than being normalized again.
+        if parsed["iframe_targets"] and not found_grid:
+            extra = read_iframe_tables(parsed["iframe_targets"], diags, force)
+            if extra:
+                more = _pick_best(extra, location, start=len(tables))
+                per_table_meta += more[3]
+                if more[0] is not None and (best is None or len(more[0]) > len(best)):
+                    best, best_shape, best_preview = more[:3]
+                tables = tables + extra
+                diags["snippets"] = _snippets(tables)
+
         if not tables:
             return {
                 "ok": False,
@@ -288,30 +656,10 @@ def fetch_coop_table(url: str, location: str) -> Dict[str, Any]:
                 **meta,
                 "status_code": resp.status_code,
                 "content_len": len(html),
-                "has_table_tag": "<table" in html.lower(),
+                "has_table_tag": _TABLE_TAG.search(resp.content) is not None,
                 "diags": diags,
             }
 
-        best = None; best_rows = 0; best_shape = None; best_preview = None
-        per_table_meta = []
-        for idx, t in enumerate(tables):
-            rows = 0
-            try:
-                norm = normalize_bid_table_smart(t, location)
-                rows = len(norm)
-                if rows > best_rows:
-                    best_rows = rows
-                    best = norm
-                    best_shape = getattr(t, "shape", None)
-                    try:
-                        best_preview = t.astype(str).head(5).to_dict(orient="list")
-                    except Exception:
-                        best_preview = None
-            except Exception as e:
-                per_table_meta.append({"index": idx, "norm_error": str(e), "shape": getattr(t, "shape", None)})
-                continue
-            per_table_meta.append({"index": idx, "normalized_rows": rows, "shape": getattr(t, "shape", None)})
-
         if best is None or best.empty:
             return {
                 "ok": False,
@@ -321,13 +669,20 @@ def fetch_coop_table(url: str, location: str) -> Dict[str, Any]:
                 "diags": {**diags, "per_table": per_table_meta, "best_preview": best_preview},
             }
 
-        return {
+        result = {
             "ok": True,
             "data": best,
             **meta,
             "best_table_shape": best_shape,
             "diags": {**diags, "per_table": per_table_meta, "best_preview": best_preview},
         }
+        # Tables pulled from iframes/CSV exports can change while the outer page stays
+        # byte-identical, so only page-only results are safe to reuse by digest.
+        if not diags["iframe_urls_tried"] and not diags["csv_urls_tried"]:
+            if len(_PARSE_CACHE) >= _PARSE_CACHE_SIZE and (url, location) not in _PARSE_CACHE:
+                _PARSE_CACHE.pop(next(iter(_PARSE_CACHE), None), None)
+            _PARSE_CACHE[(url, location)] = (digest, result)
+        return result
 
     except Exception as e:
         return {"ok": False, "error": f"parse_error: {e}", **meta}